@@ -1,10 +1,18 @@
 """Base module implementation"""
 
-import tkinter as tk
 import configparser
 import os
 import logging
 from abc import abstractmethod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tkinter as tk
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Parsed settings.ini files, keyed by (path, mtime_ns)
+_SETTINGS_CACHE: dict[tuple[str, int], dict[str, dict[str, str]]] = {}
 
 
 class ModuleDataNotAvailable(Exception):
@@ -17,6 +25,19 @@ class ModuleDataNotAvailable(Exception):
 class BaseModule:
     """Base Module for sub modules"""
 
+    __slots__ = (
+        "path",
+        "name",
+        "version",
+        "description",
+        "author",
+        "license",
+        "dependencies",
+        "settings",
+        "logger",
+        "_settings_path",
+    )
+
     def __init__(self, path: str, logger: logging.Logger):
         self.path = path
         self.name = self.__class__.__name__
@@ -26,42 +47,55 @@ class BaseModule:
         self.license = "Unspecified"
         self.dependencies = []
         self.settings = {}
-        self.logger = logger
+        self.logger = logging.LoggerAdapter(logger, {"modname": self.name})
+        self._settings_path = os.path.join(_MODULE_DIR, path, "settings.ini")
         self.load_settings()
         self.on_init()
 
     def load_settings(self):
         """Load settings from settings.ini located in the module's directory."""
-        settings_file = os.path.join(
-            os.path.dirname(__file__), self.path, "settings.ini"
-        )
-        if not os.path.exists(settings_file):
+        settings_file = self._settings_path
+        try:
+            key = (settings_file, os.stat(settings_file).st_mtime_ns)
+        except FileNotFoundError:
             self.log_warning(
                 "No settings.ini found for module %s. Using empty settings.", self.name
             )
             return
-
-        config = configparser.ConfigParser()
-        try:
-            config.read(settings_file)
-            if "Module" in config.sections():
-                self.name = config.get("Module", "name", fallback=self.name)
-                self.version = config.get("Module", "version", fallback=self.version)
-                self.description = config.get(
-                    "Module", "description", fallback=self.description
-                )
-
-            self.settings = {
-                section: dict(config.items(section)) for section in config.sections()
-            }
-            self.log_debug(
-                "Settings loaded for module %s: %s", self.name, self.settings
-            )
-        except (configparser.Error, OSError) as error:
+        except OSError as error:
             self.log_error(
                 "Failed to load settings for module %s: %s", self.name, error
             )
             self.settings = {}
+            return
+
+        settings = _SETTINGS_CACHE.get(key)
+        if settings is None:
+            config = configparser.ConfigParser()
+            try:
+                config.read(settings_file)
+                settings = {
+                    section: dict(config.items(section))
+                    for section in config.sections()
+                }
+            except (configparser.Error, OSError) as error:
+                self.log_error(
+                    "Failed to load settings for module %s: %s", self.name, error
+                )
+                self.settings = {}
+                return
+            _SETTINGS_CACHE[key] = settings
+
+        # Copy so instances can't modify the cached settings
+        self.settings = {section: dict(items) for section, items in settings.items()}
+        if "Module" in self.settings:
+            module_section = self.settings["Module"]
+            self.name = module_section.get("name", self.name)
+            self.logger.extra["modname"] = self.name
+            self.version = module_section.get("version", self.version)
+            self.description = module_section.get("description", self.description)
+
+        self.log_debug("Settings loaded for module %s: %s", self.name, self.settings)
 
     def validate_settings(self, required_keys: dict):
         """Validate if required keys exist in the settings."""
@@ -73,36 +107,20 @@ class BaseModule:
                     raise KeyError(f"Missing key '{key}' in section '{section}'")
 
     def log_debug(self, message, *args):
-        """Log info message."""
-        message = f"[{self.name}]: {message}"
-        if args:
-            self.logger.debug(message % args)
-        else:
-            self.logger.debug(message)
+        """Log debug message."""
+        self.logger.debug(message, *args)
 
     def log_info(self, message, *args):
         """Log info message."""
-        message = f"[{self.name}]: {message}"
-        if args:
-            self.logger.info(message % args)
-        else:
-            self.logger.info(message)
+        self.logger.info(message, *args)
 
     def log_warning(self, message, *args):
         """Log warning message."""
-        message = f"[{self.name}]: {message}"
-        if args:
-            self.logger.warning(message % args)
-        else:
-            self.logger.warning(message)
+        self.logger.warning(message, *args)
 
     def log_error(self, message, *args):
         """Log error message."""
-        message = f"[{self.name}]: {message}"
-        if args:
-            self.logger.error(message % args)
-        else:
-            self.logger.error(message)
+        self.logger.error(message, *args)
 
     def on_init(self):
         """Hook for custom initialization logic."""
@@ -113,6 +131,6 @@ class BaseModule:
         self.log_debug("Module %s cleaned up", self.name)
 
     @abstractmethod
-    def display_module(self, frame: tk.Frame) -> None:
+    def display_module(self, frame: "tk.Frame") -> None:
         """Display module."""
         raise ModuleDataNotAvailable(self.name)
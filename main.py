@@ -1,18 +1,21 @@
 """ Dashboard for an easier life """
 
+import atexit
 import importlib
 import importlib.util
-import importlib.abc
-import importlib.machinery
-from importlib.machinery import ModuleSpec
+import io
 import os
 import logging
 import sys
+import threading
 import tkinter as tk
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 import time
 from base_module import BaseModule
 
+if TYPE_CHECKING:
+    from importlib.machinery import ModuleSpec
+
 
 DARK_MODE_BG = "#202020"
 DARK_MODE_TEXT = "#ffffff"
@@ -38,63 +41,145 @@ LOGGER_COLORS = {
     "CRITICAL": "\033[91m",
     "ENDC": "\033[0m",
 }
+LOGGER_FORMAT = "%(asctime)s [%(name)s] [%(levelname)s] [%(modname)s]: %(message)s"
+LOGGER_DEFAULTS = {"modname": "Dashboard"}
+
+
+def buffered_stderr() -> Optional[io.TextIOWrapper]:
+    """Wrap the stderr file descriptor in a 64 KiB buffer, if there is one"""
+    stream = sys.stderr
+    if stream is None:
+        return None
+    try:
+        fileno = stream.fileno()
+    except (OSError, io.UnsupportedOperation):
+        return None
+    return io.TextIOWrapper(
+        open(fileno, "wb", buffering=65536, closefd=False),
+        encoding=getattr(stream, "encoding", None),
+        errors="backslashreplace",
+    )
+
+
+class DefaultsFilter(logging.Filter):
+    """Fill in LOGGER_DEFAULTS for records that don't set those fields"""
+
+    def filter(self, record):
+        for key, value in LOGGER_DEFAULTS.items():
+            record.__dict__.setdefault(key, value)
+        return True
+
+
+class ColorFormatter(logging.Formatter):
+    """Formatter that wraps each record in its level's console color"""
 
+    def format(self, record):
+        return (
+            LOGGER_COLORS[record.levelname]
+            + super().format(record)
+            + LOGGER_COLORS["ENDC"]
+        )
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """Stream handler that batches writes and flushes on a timer or on errors"""
+
+    def __init__(
+        self,
+        stream,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.ERROR,
+    ):
+        super().__init__(stream)
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._closed = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="log-flush", daemon=True
+        )
+        self._flush_thread.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self) -> None:
+        """Flush the handler every flush_interval seconds until it is closed"""
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
 
-class ConsoleHandler(logging.StreamHandler):
-    """Console handler class"""
+    def flush(self):
+        self.acquire()
+        try:
+            if not self.stream.closed:
+                self.stream.flush()
+        finally:
+            self.release()
 
     def emit(self, record):
         try:
             msg = self.format(record)
-            stream = self.stream
-            stream.write(LOGGER_COLORS[record.levelname])
-            stream.write(msg + self.terminator)
-            stream.write(LOGGER_COLORS["ENDC"])
-            self.flush()
+            self.stream.write(msg + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.flush()
         except RecursionError:
             raise
         except Exception:  # pylint: disable=broad-except
             self.handleError(record)
 
+    def close(self):
+        self._closed.set()
+        self.flush()
+        super().close()
+
+
+class BufferedFileHandler(BufferedStreamHandler):
+    """File handler class, batches writes and flushes on a timer or on errors"""
+
+    def __init__(self, log_path: str, flush_level: int = logging.ERROR):
+        self.log_path = log_path
+        # pylint: disable=consider-using-with
+        super().__init__(
+            open(log_path, "a", buffering=65536, encoding="utf-8"),
+            flush_interval=30.0,
+            flush_level=flush_level,
+        )
+
+    def close(self):
+        super().close()
+        self.acquire()
+        try:
+            self.stream.close()
+        finally:
+            self.release()
+
 
 def settup_logging(debug: bool = False) -> logging.Logger:
     """Set up logging"""
+    os.makedirs("logs", exist_ok=True)
     log_path = f"logs/{time.strftime('%Y-%m-%d')}.log"
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG if debug else logging.INFO)
 
-    file_handler = logging.FileHandler(log_path)
+    file_handler = BufferedFileHandler(log_path)
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(
-        logging.Formatter("%(asctime)s [%(name)s] [%(levelname)s]: %(message)s")
-    )
+    file_handler.addFilter(DefaultsFilter())
+    file_handler.setFormatter(logging.Formatter(LOGGER_FORMAT))
 
-    console_handler = ConsoleHandler()
-    console_handler.setLevel(logging.DEBUG if debug else logging.INFO)
-    console_handler.setFormatter(
-        logging.Formatter("%(asctime)s [%(name)s] [%(levelname)s]: %(message)s")
+    stderr = buffered_stderr()
+    console_handler = (
+        BufferedStreamHandler(stderr) if stderr else logging.StreamHandler()
     )
+    console_handler.setLevel(logging.DEBUG if debug else logging.INFO)
+    console_handler.addFilter(DefaultsFilter())
+    console_handler.setFormatter(ColorFormatter(LOGGER_FORMAT))
 
     logger.handlers = [
         file_handler,
         console_handler,
     ]
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[file_handler, console_handler],
-    )
     logger.info("Logging set up.")
     return logger
 
 
 ###################### MODULES ######################
-class ModuleDataNotAvailable(Exception):
-    """Module data not available exception"""
-
-    def __init__(self, module_name: str):
-        super().__init__(f"Module data not available: {module_name}")
-
 
 # setup main logger
 MAIN_LOGGER = settup_logging("-d" in sys.argv or "--debug" in sys.argv)
@@ -107,17 +192,30 @@ SCREEN_HEIGHT = 1080
 class DashModule:
     """Module class"""
 
-    name: str = "Module"
-    path: str = ""
+    __slots__ = (
+        "path",
+        "name",
+        "settings_path",
+        "data",
+        "frame",
+        "_spec",
+        "_loader",
+        "_sub_module",
+        "_sub_class",
+    )
 
-    settings_path: str = ""
-    data: dict = {}
+    # Attributes written by Dashboard.save_settings, in file order
+    SETTINGS_KEYS = ("_spec", "frame", "_loader", "_sub_module", "_sub_class")
 
     # Set up logging
 
-    def __init__(self, path: str, spec: ModuleSpec):
+    def __init__(self, path: str, spec: "ModuleSpec"):
         self.path = path  # path ex: "modules/module_name"
-        self.name = path.split("/")[-1].split(".")[0].replace("_", " ").title()
+        base = os.path.basename(path)
+        stem = base.rpartition(".")[0] or base
+        self.name = stem.replace("_", " ").title()
+        self.settings_path = ""
+        self.data: dict = {}
         self._spec = spec
         self.frame = None
         self._loader = None
@@ -128,6 +226,21 @@ class DashModule:
         """Run the module, to create a data file in 'data' folder."""
         logging.info("Running module %s", self)
         self.frame = frame
+        if frame.winfo_ismapped():
+            return self.display(frame)
+
+        # Only load and display the module once its frame is visible
+        def on_map(_) -> None:
+            frame.unbind("<Map>")
+            self.display(frame)
+
+        frame.bind("<Map>", on_map)
+        return 0
+
+    def display(self, frame: tk.Frame) -> int:
+        """Display the module in the frame, loading it first if needed."""
+        if self._sub_class is None:
+            self.load_module()
         if not self._sub_class:
             logging.error("Module is not loaded.")
             return -1
@@ -154,22 +267,23 @@ class DashModule:
             MAIN_LOGGER.error("Error executing module %s: %s", self.path, error)
             return
 
-        found_subclass = False  # Track if we found a valid subclass
-
-        for cls_name, cls in self._sub_module.__dict__.items():
-            if (
-                isinstance(cls, type)
-                and issubclass(cls, BaseModule)
-                and cls is not BaseModule
-            ):
-                logging.info("Found class %s in module %s", cls_name, self.path)
-                self._sub_class = cls(self.path, MAIN_LOGGER)
-                found_subclass = True
-                break  # Stop searching once we find the valid subclass
-
-        if not found_subclass:
+        cls = next(
+            (
+                value
+                for value in vars(self._sub_module).values()
+                if isinstance(value, type)
+                and issubclass(value, BaseModule)
+                and value is not BaseModule
+            ),
+            None,
+        )
+        if cls is None:
             logging.error("No subclass of BaseModule found in %s", self.path)
             logging.debug("Module dictionary contents: %s", self._sub_module.__dict__)
+            return
+
+        logging.info("Found class %s in module %s", cls.__name__, self.path)
+        self._sub_class = cls(self.path, MAIN_LOGGER)
 
     def is_loaded(self) -> bool:
         """Check if module is loaded"""
@@ -192,6 +306,8 @@ class Dashboard(tk.Tk):
         super().__init__()
         self.title("Py Dashboard")
         self.modules: List[DashModule] = []
+        # Settings last written to each settings path
+        self._saved_settings: dict[str, str] = {}
         self.bg_color = LIGHT_MODE_BG
         self.text_color = LIGHT_MODE_TEXT
         self.moduels_amount = 0
@@ -220,23 +336,37 @@ class Dashboard(tk.Tk):
         """Load modules"""
 
         logging.debug("Looking for modules in %s", MODULES_PATH)
-        for module_folder in os.listdir(MODULES_PATH):
-            logging.debug("Found module folder: %s", module_folder)
-            try:
-                modules_folder = os.path.join(MODULES_PATH, module_folder)
-                module_exec_path = os.path.join(modules_folder, f"{module_folder}.py")
-                logging.debug("Loading module from path: %s", module_exec_path)
-                spec = importlib.util.spec_from_file_location(
-                    module_folder, module_exec_path
-                )
-                if spec is None:
-                    raise FileNotFoundError(
-                        f"Module spec not found for {module_exec_path}"
-                    )
-                module = DashModule(modules_folder, spec)
-                self.modules.append(module)
-            except Exception as error:
-                MAIN_LOGGER.error("Error loading module %s: %s", module_folder, error)
+        # Bind hot lookups once, this runs for every module folder on startup
+        modules_append = self.modules.append
+        path_join = os.path.join
+        is_file = os.path.isfile
+        spec_from_file_location = importlib.util.spec_from_file_location
+        log_debug = logging.debug
+        log_error = MAIN_LOGGER.error
+
+        with os.scandir(MODULES_PATH) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                module_folder = entry.name
+                log_debug("Found module folder: %s", module_folder)
+                try:
+                    modules_folder = entry.path
+                    module_exec_path = path_join(modules_folder, f"{module_folder}.py")
+                    if not is_file(module_exec_path):
+                        raise FileNotFoundError(
+                            f"Module file not found: {module_exec_path}"
+                        )
+                    log_debug("Loading module from path: %s", module_exec_path)
+                    spec = spec_from_file_location(module_folder, module_exec_path)
+                    if spec is None:
+                        raise FileNotFoundError(
+                            f"Module spec not found for {module_exec_path}"
+                        )
+                    module = DashModule(modules_folder, spec)
+                    modules_append(module)
+                except Exception as error:
+                    log_error("Error loading module %s: %s", module_folder, error)
 
     def destroy_frames(self) -> None:
         """Destroy frames"""
@@ -263,33 +393,27 @@ class Dashboard(tk.Tk):
         cols = min(modules_amount, max(modules_amount // 2, 1))
         rows = (modules_amount + cols - 1) // cols
 
+        module_width = self.width // cols
+        module_height = self.height // rows
+
+        # Keep the window from re-fitting itself to every new frame
+        self.grid_propagate(False)
+
         # Create frames
         frames: list[tk.Frame] = []
 
         for i, module in enumerate(self.modules):
-            # Adjust the width of the last frame
-
             row, col = divmod(i, cols)
-            module_width = self.width // cols
-            module_height = self.height // rows
             frame = tk.Frame(
                 self,
                 bg=self.bg_color,
                 width=module_width,
                 height=module_height,
             )
-
+            frame.grid_propagate(False)
             frame.grid(row=row, column=col, sticky="nsew")
-            frame.update_idletasks()
-            frame_position = frame.winfo_geometry().split("+")
-            frame_pos_x, frame_pos_y = frame_position[1], frame_position[2]
-            size = frame_position[0].split("x")
-            frame_width, frame_height = size[0], size[1]
-            logging.info(
-                "Module '%s' size: %s, %s", module.name, frame_width, frame_height
-            )
             logging.info(
-                "Module '%s' position: %s, %s", module.name, frame_pos_x, frame_pos_y
+                "Module '%s' size: %s, %s", module.name, module_width, module_height
             )
             frames.append(frame)
 
@@ -299,26 +423,38 @@ class Dashboard(tk.Tk):
     def save_settings(self) -> None:
         """Save settings"""
         for module in self.modules:
-            with open(module.settings_path, "w", encoding="utf-8") as file:
-                for key, value in module.__dict__.items():
-                    if key in ["name", "path", "settings_path"]:
-                        continue
-                    file.write(f"{key}={value}\n")
+            buffer = io.StringIO()
+            for key in module.SETTINGS_KEYS:
+                buffer.write(f"{key}={getattr(module, key)}\n")
+            content = buffer.getvalue()
+
+            # Skip the write if nothing changed since the last save
+            if self._saved_settings.get(module.settings_path) == content:
+                continue
+
+            with open(
+                module.settings_path, "w", encoding="utf-8", buffering=65536
+            ) as file:
+                file.write(content)
+            self._saved_settings[module.settings_path] = content
 
     def reload_layout(self) -> None:
         """Reload layout"""
         self.destroy_frames()
-        self.update()
         self.frames = self.create_frames()
-        self.update()
+        self.update_idletasks()
 
         # do Run on all modules for each frame
+        log_geometry = MAIN_LOGGER.isEnabledFor(logging.DEBUG)
         for module, frame in zip(self.modules, self.frames):
-            geometry = frame.winfo_geometry().split("+")
-            position = geometry[1], geometry[2]
-            size = geometry[0].split("x")
-            print(f"Module {module.name} frame position: {position} and size {size}")
-            module.load_module()
+            if log_geometry:
+                size, _, position = frame.winfo_geometry().partition("+")
+                logging.debug(
+                    "Module '%s' frame position: %s and size %s",
+                    module.name,
+                    position,
+                    size,
+                )
             module.run(frame)
 
         self.after(1000 * 60 * 10, self.reload_layout)
@@ -338,8 +474,9 @@ class Dashboard(tk.Tk):
         self.reload_layout()
 
     def toggle_dark_mode(self, _) -> None:
-        """Toggle dark mode and recalculate layout"""
+        """Toggle dark mode and recolor the existing widgets"""
         self.dark_mode = not self.dark_mode
+        old_bg_color, old_text_color = self.bg_color, self.text_color
 
         if self.dark_mode:
             self.bg_color = DARK_MODE_BG
@@ -349,7 +486,21 @@ class Dashboard(tk.Tk):
             self.text_color = LIGHT_MODE_TEXT
 
         self.configure(bg=self.bg_color)
-        self.reload_layout()
+        self._recolor(self, old_bg_color, old_text_color)
+
+    def _recolor(self, widget: tk.Misc, old_bg_color: str, old_text_color: str) -> None:
+        """Recolor children of widget that still use the previous theme colors"""
+        for child in widget.winfo_children():
+            for option, old_color, new_color in (
+                ("bg", old_bg_color, self.bg_color),
+                ("fg", old_text_color, self.text_color),
+            ):
+                try:
+                    if child.cget(option) == old_color:
+                        child.configure({option: new_color})
+                except tk.TclError:
+                    pass
+            self._recolor(child, old_bg_color, old_text_color)
 
 
 def main():